@@ -3,17 +3,130 @@ Alerts Module
 Monitors price thresholds and triggers notifications
 """
 
+import atexit
 import logging
+import queue
 import smtplib
-from email.mime.text import MIMEText
-from email.mime.multipart import MIMEMultipart
-from typing import List, Dict
+import threading
+import time
+import numpy as np
+import pandas as pd
+from email.message import EmailMessage
+from email.policy import SMTP as _SMTP_POLICY
+from typing import Dict, List, Optional, Union
 from datetime import datetime
 from config import Config
+from fetch_data import QuoteBatch
 
 # Configure logging
 logger = logging.getLogger(__name__)
 
+# Recycle the SMTP connection after this many messages
+SMTP_MAX_MESSAGES_PER_CONNECTION = 100
+
+# Bounded email queue: when full, new alert batches are dropped (loudly)
+# rather than letting the queue grow without limit
+ALERT_QUEUE_MAXSIZE = 512
+
+# Fixed-shape subject line, interpolated per send
+_SUBJECT_TMPL = "🚨 Market Alert: {n} Price Threshold(s) Crossed"
+
+# SMTP codes that signal temporary overload/rate limiting on the relay
+_SMTP_TEMP_FAIL_CODES = {421, 451, 452}
+
+# How many times the worker retries a batch that hit a temporary failure
+_SMTP_TEMP_FAIL_RETRIES = 3
+
+
+class _SendBackoff:
+    """
+    Exponential backoff for temporary SMTP relay failures
+
+    Only the single smtp-worker thread ever sends, so the gate that
+    matters is how long it waits after the relay signals overload: each
+    consecutive temporary failure doubles the delay (capped), and a
+    successful send resets it.
+    """
+
+    def __init__(self, cap: float = 30.0):
+        """
+        Args:
+            cap: Maximum backoff delay in seconds
+        """
+        self.cap = cap
+        self._consecutive_failures = 0
+
+    def on_success(self):
+        """Record a successful send; reset the backoff"""
+        self._consecutive_failures = 0
+
+    def on_temporary_failure(self) -> float:
+        """
+        Record a temporary failure
+
+        Returns:
+            Seconds to back off before the next send attempt
+        """
+        self._consecutive_failures += 1
+        return min(self.cap, float(2 ** self._consecutive_failures))
+
+# Email templates, built once at import time so per-send work is just
+# filling in the variable parts and joining
+_TEXT_HEADER = "MARKET PRICE ALERTS\n" + "=" * 50 + "\n\n"
+
+_TEXT_ALERT_TMPL = (
+    "Symbol: {symbol}\n"
+    "Current Price: ${current_price:.2f}\n"
+    "Alert Type: {threshold_type}\n"
+    "Threshold: ${threshold_value:.2f}\n"
+    "Time: {timestamp}\n"
+    + "-" * 50 + "\n\n"
+)
+
+_TEXT_FOOTER_TMPL = (
+    "\nTotal Alerts: {count}\n"
+    "Generated: {generated}\n"
+)
+
+_HTML_HEADER = """
+        <html>
+        <head>
+            <style>
+                body { font-family: Arial, sans-serif; }
+                .header { background-color: #f44336; color: white; padding: 20px; text-align: center; }
+                .alert-box { background-color: #f9f9f9; border-left: 5px solid #f44336; margin: 20px 0; padding: 15px; }
+                .alert-high { border-left-color: #f44336; }
+                .alert-medium { border-left-color: #ff9800; }
+                .price { font-size: 24px; font-weight: bold; color: #333; }
+                .footer { margin-top: 30px; padding: 20px; background-color: #f0f0f0; text-align: center; font-size: 12px; }
+            </style>
+        </head>
+        <body>
+            <div class="header">
+                <h1>🚨 Market Price Alerts</h1>
+            </div>
+        """
+
+_HTML_ALERT_TMPL = """
+            <div class="alert-box {severity_class}">
+                <h2>{symbol}</h2>
+                <p class="price">Current Price: ${current_price:.2f}</p>
+                <p><strong>Alert Type:</strong> {alert_type}</p>
+                <p><strong>Threshold:</strong> ${threshold_value:.2f}</p>
+                <p><strong>Time:</strong> {timestamp}</p>
+            </div>
+            """
+
+_HTML_FOOTER_TMPL = """
+            <div class="footer">
+                <p>Total Alerts: {count}</p>
+                <p>Generated: {generated}</p>
+                <p>Market Data Automation Tool</p>
+            </div>
+        </body>
+        </html>
+        """
+
 
 class AlertManager:
     """
@@ -24,88 +137,204 @@ class AlertManager:
         """Initialize alert manager"""
         self.thresholds = Config.ALERT_THRESHOLDS
         self.email_enabled = Config.ENABLE_EMAIL_ALERTS
-        
+
+        # Persistent SMTP connection, created lazily and reused across sends
+        self._smtp: Optional[smtplib.SMTP] = None
+        self._smtp_msg_count = 0
+        atexit.register(self._close_smtp)
+
+        # Email sending happens on a worker thread fed by a bounded queue,
+        # so SMTP latency stays off the main run() path
+        self._send_q: Optional[queue.Queue] = None
+        self._backoff = _SendBackoff()
+        if self.email_enabled:
+            self._send_q = queue.Queue(maxsize=ALERT_QUEUE_MAXSIZE)
+            worker = threading.Thread(target=self._smtp_worker, daemon=True, name='smtp-worker')
+            worker.start()
+            # Registered after _close_smtp so it runs first (atexit is LIFO):
+            # drain pending emails, then close the connection
+            atexit.register(self.flush)
+
         logger.info(f"Alert Manager initialized with {len(self.thresholds)} threshold configurations")
-        
+
         if self.email_enabled:
             logger.info("Email alerts are ENABLED")
         else:
             logger.info("Email alerts are DISABLED (console only)")
-    
-    def check_thresholds(self, quote_data: Dict) -> List[Dict]:
+
+    @property
+    def thresholds(self) -> Dict:
+        """Configured thresholds per symbol"""
+        return self._thresholds
+
+    @thresholds.setter
+    def thresholds(self, value: Dict):
+        """Set thresholds and rebuild the derived lookup arrays"""
+        self._thresholds = value
+        self._rebuild_threshold_arrays()
+
+    def _rebuild_threshold_arrays(self):
+        """Build the flattened threshold lookups and NumPy min/max arrays for fast checks"""
+        self._sym_idx = {symbol: i for i, symbol in enumerate(self._thresholds)}
+        # Per-symbol (min, max) with unconfigured sides widened to +/-inf,
+        # so the in-range fast path is two plain comparisons
+        self._fast = {
+            symbol: (
+                t.get('min') if t.get('min') is not None else float('-inf'),
+                t.get('max') if t.get('max') is not None else float('inf')
+            )
+            for symbol, t in self._thresholds.items()
+        }
+        self._min_arr = np.array(
+            [t.get('min') if t.get('min') is not None else np.nan for t in self._thresholds.values()],
+            dtype=np.float64
+        )
+        self._max_arr = np.array(
+            [t.get('max') if t.get('max') is not None else np.nan for t in self._thresholds.values()],
+            dtype=np.float64
+        )
+
+    def check_thresholds(self, quote_data: Dict, now_iso: str = None) -> List[Dict]:
         """
         Check if a quote triggers any alerts
-        
+
         Args:
             quote_data: Dictionary with quote information
-        
+            now_iso: Fallback ISO timestamp, precomputed by batch callers
+                     so it isn't re-derived per quote (optional)
+
         Returns:
             List of triggered alerts
         """
         symbol = quote_data.get('symbol')
         price = quote_data.get('price')
-        
+
         if not symbol or price is None:
             return []
-        
-        # Check if this symbol has thresholds configured
-        if symbol not in self.thresholds:
+
+        # Fast path: one dict probe and two comparisons, nothing allocated
+        bounds = self._fast.get(symbol)
+        if bounds is None:
             return []
-        
-        thresholds = self.thresholds[symbol]
+
+        min_val, max_val = bounds
+        if min_val <= price <= max_val:
+            return []
+
+        # Rare path: a threshold was actually crossed, so formatting and
+        # alert allocation only happen here
+        timestamp = quote_data.get('timestamp') or now_iso or datetime.utcnow().isoformat()
         alerts = []
-        
-        # Check minimum threshold
-        if thresholds.get('min') is not None:
-            if price < thresholds['min']:
-                alert = {
-                    'symbol': symbol,
-                    'current_price': price,
-                    'threshold_type': 'BELOW_MINIMUM',
-                    'threshold_value': thresholds['min'],
-                    'message': f"🔴 ALERT: {symbol} fell below ${thresholds['min']:.2f}! Current: ${price:.2f}",
-                    'timestamp': quote_data.get('timestamp', datetime.utcnow().isoformat()),
-                    'severity': 'HIGH'
-                }
-                alerts.append(alert)
-                logger.warning(alert['message'])
-        
-        # Check maximum threshold
-        if thresholds.get('max') is not None:
-            if price > thresholds['max']:
-                alert = {
-                    'symbol': symbol,
-                    'current_price': price,
-                    'threshold_type': 'ABOVE_MAXIMUM',
-                    'threshold_value': thresholds['max'],
-                    'message': f"🟢 ALERT: {symbol} exceeded ${thresholds['max']:.2f}! Current: ${price:.2f}",
-                    'timestamp': quote_data.get('timestamp', datetime.utcnow().isoformat()),
-                    'severity': 'HIGH'
-                }
-                alerts.append(alert)
-                logger.warning(alert['message'])
-        
+
+        if price < min_val:
+            alerts.append(self._build_alert(symbol, price, 'BELOW_MINIMUM', min_val, timestamp))
+
+        if price > max_val:
+            alerts.append(self._build_alert(symbol, price, 'ABOVE_MAXIMUM', max_val, timestamp))
+
         return alerts
-    
-    def check_multiple(self, quotes: List[Dict]) -> List[Dict]:
+
+    def _build_alert(self, symbol: str, price: float, threshold_type: str,
+                     threshold_value: float, timestamp: str) -> Dict:
+        """
+        Build an alert dictionary for a crossed threshold
+
+        Args:
+            symbol: Symbol that triggered the alert
+            price: Current price
+            threshold_type: 'BELOW_MINIMUM' or 'ABOVE_MAXIMUM'
+            threshold_value: Threshold that was crossed
+            timestamp: Quote timestamp
+
+        Returns:
+            Alert dictionary
+        """
+        if threshold_type == 'BELOW_MINIMUM':
+            message = f"🔴 ALERT: {symbol} fell below ${threshold_value:.2f}! Current: ${price:.2f}"
+        else:
+            message = f"🟢 ALERT: {symbol} exceeded ${threshold_value:.2f}! Current: ${price:.2f}"
+
+        alert = {
+            'symbol': symbol,
+            'current_price': price,
+            'threshold_type': threshold_type,
+            'threshold_value': threshold_value,
+            'message': message,
+            'timestamp': timestamp,
+            'severity': 'HIGH'
+        }
+
+        logger.warning(alert['message'])
+        return alert
+
+    def check_multiple(self, quotes: Union[QuoteBatch, pd.DataFrame, List[Dict]]) -> List[Dict]:
         """
         Check thresholds for multiple quotes
-        
+
+        Vectorized with NumPy: the min/max comparisons run as two array
+        operations instead of one Python-level check per quote, so large
+        symbol sets stay cheap. Alert dictionaries are only materialized
+        for the (rare) quotes that actually crossed a threshold.
+
         Args:
-            quotes: List of quote dictionaries
-        
+            quotes: QuoteBatch, DataFrame, or list of quote dictionaries
+
         Returns:
             List of all triggered alerts
         """
+        # A QuoteBatch/DataFrame is already column-oriented, so its
+        # columns can be used directly; lists of dicts need one pass
+        frame = getattr(quotes, 'frame', quotes if isinstance(quotes, pd.DataFrame) else None)
+
+        if frame is not None:
+            if frame.empty or not self._sym_idx:
+                return []
+            symbols = frame['symbol'].tolist()
+            prices = pd.to_numeric(frame['price'], errors='coerce').to_numpy(dtype=np.float64)
+            timestamps = frame['timestamp'].tolist() if 'timestamp' in frame.columns else [None] * len(symbols)
+        else:
+            if not quotes or not self._sym_idx:
+                return []
+            symbols = [q.get('symbol') for q in quotes]
+            prices = np.fromiter(
+                (q['price'] if q.get('price') is not None else np.nan for q in quotes),
+                dtype=np.float64, count=len(quotes)
+            )
+            timestamps = [q.get('timestamp') for q in quotes]
+
+        idx = np.fromiter(
+            (self._sym_idx.get(s, -1) for s in symbols),
+            dtype=np.int64, count=len(symbols)
+        )
+
+        # Comparisons against NaN (no threshold configured) are False,
+        # so unconfigured sides never trigger
+        tracked = idx >= 0
+        safe_idx = np.where(tracked, idx, 0)
+        below = tracked & (prices < self._min_arr[safe_idx])
+        above = tracked & (prices > self._max_arr[safe_idx])
+
+        # One wall-clock read shared by every alert in the batch
+        now_iso = datetime.utcnow().isoformat()
+
         all_alerts = []
-        
-        for quote in quotes:
-            alerts = self.check_thresholds(quote)
-            all_alerts.extend(alerts)
-        
+        for i in np.nonzero(below | above)[0]:
+            timestamp = timestamps[i] or now_iso
+            symbol = symbols[i]
+            price = float(prices[i])
+
+            if below[i]:
+                all_alerts.append(
+                    self._build_alert(symbol, price, 'BELOW_MINIMUM', float(self._min_arr[idx[i]]), timestamp)
+                )
+            if above[i]:
+                all_alerts.append(
+                    self._build_alert(symbol, price, 'ABOVE_MAXIMUM', float(self._max_arr[idx[i]]), timestamp)
+                )
+
         if all_alerts:
             logger.info(f"Triggered {len(all_alerts)} alerts")
-        
+
         return all_alerts
     
     def send_alerts(self, alerts: List[Dict]):
@@ -117,16 +346,62 @@ class AlertManager:
         """
         if not alerts:
             return
-        
+
         # Always send console alerts
         self._send_console_alerts(alerts)
-        
-        # Send email alerts if enabled
+
+        # Queue email alerts for the worker thread if enabled
         if self.email_enabled:
             try:
-                self._send_email_alerts(alerts)
+                self._send_q.put_nowait(alerts)
+            except queue.Full:
+                logger.warning(f"Alert email queue full, dropping batch of {len(alerts)} alert(s)")
+
+    def _smtp_worker(self):
+        """Drain the alert queue and send emails over the pooled connection"""
+        while True:
+            alerts = self._send_q.get()
+            try:
+                self._send_with_backpressure(alerts)
             except Exception as e:
                 logger.error(f"Failed to send email alerts: {e}")
+            finally:
+                self._send_q.task_done()
+
+    def _send_with_backpressure(self, alerts: List[Dict]):
+        """
+        Send one alert batch, backing off on relay overload
+
+        Temporary relay failures (421/451/452) make the worker wait with
+        exponentially growing delays before retrying; anything else
+        propagates.
+
+        Args:
+            alerts: List of alert dictionaries
+        """
+        for attempt in range(_SMTP_TEMP_FAIL_RETRIES):
+            try:
+                self._send_email_alerts(alerts)
+                self._backoff.on_success()
+                return
+
+            except smtplib.SMTPResponseException as e:
+                if e.smtp_code not in _SMTP_TEMP_FAIL_CODES:
+                    raise
+
+                delay = self._backoff.on_temporary_failure()
+                logger.warning(
+                    f"SMTP relay overloaded ({e.smtp_code}), "
+                    f"backing off {delay:.0f}s (attempt {attempt + 1}/{_SMTP_TEMP_FAIL_RETRIES})"
+                )
+                time.sleep(delay)
+
+        logger.error(f"Dropping alert batch after {_SMTP_TEMP_FAIL_RETRIES} temporary SMTP failures")
+
+    def flush(self):
+        """Block until all queued email alerts have been sent"""
+        if self._send_q is not None:
+            self._send_q.join()
     
     def _send_console_alerts(self, alerts: List[Dict]):
         """
@@ -147,10 +422,55 @@ class AlertManager:
         
         print("\n" + "="*70 + "\n")
     
+    def _get_smtp(self) -> smtplib.SMTP:
+        """
+        Get a live, authenticated SMTP connection
+
+        Reuses the cached connection when it's healthy; reconnects when it
+        has gone stale or has carried too many messages.
+
+        Returns:
+            Authenticated SMTP connection
+        """
+        if self._smtp is not None:
+            # Recycle after a fixed number of messages per connection
+            if self._smtp_msg_count >= SMTP_MAX_MESSAGES_PER_CONNECTION:
+                logger.info("Recycling SMTP connection after message limit")
+                self._close_smtp()
+            else:
+                try:
+                    self._smtp.noop()
+                    return self._smtp
+                except Exception:
+                    logger.info("Cached SMTP connection is stale, reconnecting")
+                    self._close_smtp()
+
+        smtp = smtplib.SMTP(Config.SMTP_SERVER, Config.SMTP_PORT)
+        smtp.starttls()
+        smtp.login(Config.SMTP_USERNAME, Config.SMTP_PASSWORD)
+
+        self._smtp = smtp
+        self._smtp_msg_count = 0
+        logger.info(f"Established SMTP connection to {Config.SMTP_SERVER}")
+        return smtp
+
+    def _close_smtp(self):
+        """Close the cached SMTP connection, if any"""
+        if self._smtp is None:
+            return
+
+        try:
+            self._smtp.quit()
+        except Exception:
+            pass
+
+        self._smtp = None
+        self._smtp_msg_count = 0
+
     def _send_email_alerts(self, alerts: List[Dict]):
         """
         Send alerts via email
-        
+
         Args:
             alerts: List of alert dictionaries
         """
@@ -159,113 +479,83 @@ class AlertManager:
             return
         
         try:
-            # Create message
-            msg = MIMEMultipart('alternative')
-            msg['Subject'] = f"🚨 Market Alert: {len(alerts)} Price Threshold(s) Crossed"
+            # Create message - EmailMessage with the SMTP policy serializes
+            # headers faster than the legacy MIMEMultipart machinery
+            msg = EmailMessage(policy=_SMTP_POLICY)
+            msg['Subject'] = _SUBJECT_TMPL.format(n=len(alerts))
             msg['From'] = Config.SMTP_USERNAME
             msg['To'] = Config.ALERT_EMAIL_TO
+
+            # Create email body (one generation timestamp for both parts);
+            # the HTML alternative is only built when it will be sent
+            generated = datetime.utcnow().strftime('%Y-%m-%d %H:%M:%S UTC')
+            msg.set_content(self._create_text_email_body(alerts, generated))
+
+            if Config.ALERT_EMAIL_HTML:
+                msg.add_alternative(self._create_html_email_body(alerts, generated), subtype='html')
             
-            # Create email body
-            text_body = self._create_text_email_body(alerts)
-            html_body = self._create_html_email_body(alerts)
-            
-            part1 = MIMEText(text_body, 'plain')
-            part2 = MIMEText(html_body, 'html')
-            
-            msg.attach(part1)
-            msg.attach(part2)
-            
-            # Send email
-            with smtplib.SMTP(Config.SMTP_SERVER, Config.SMTP_PORT) as server:
-                server.starttls()
-                server.login(Config.SMTP_USERNAME, Config.SMTP_PASSWORD)
-                server.send_message(msg)
-            
+            # Send email over the pooled connection
+            server = self._get_smtp()
+            server.send_message(msg)
+            self._smtp_msg_count += 1
+
             logger.info(f"Email alert sent successfully to {Config.ALERT_EMAIL_TO}")
-        
+
         except Exception as e:
             logger.error(f"Error sending email: {e}")
+            # Drop the connection so the next send starts fresh
+            self._close_smtp()
             raise
     
-    def _create_text_email_body(self, alerts: List[Dict]) -> str:
+    def _create_text_email_body(self, alerts: List[Dict], generated: str = None) -> str:
         """
         Create plain text email body
-        
+
         Args:
             alerts: List of alert dictionaries
-        
+            generated: Precomputed generation timestamp (optional)
+
         Returns:
             Plain text email body
         """
-        body = "MARKET PRICE ALERTS\n"
-        body += "=" * 50 + "\n\n"
-        
-        for alert in alerts:
-            body += f"Symbol: {alert['symbol']}\n"
-            body += f"Current Price: ${alert['current_price']:.2f}\n"
-            body += f"Alert Type: {alert['threshold_type']}\n"
-            body += f"Threshold: ${alert['threshold_value']:.2f}\n"
-            body += f"Time: {alert['timestamp']}\n"
-            body += "-" * 50 + "\n\n"
-        
-        body += f"\nTotal Alerts: {len(alerts)}\n"
-        body += f"Generated: {datetime.utcnow().strftime('%Y-%m-%d %H:%M:%S UTC')}\n"
-        
-        return body
+        parts = [_TEXT_HEADER]
+        parts.extend(_TEXT_ALERT_TMPL.format(**alert) for alert in alerts)
+        parts.append(_TEXT_FOOTER_TMPL.format(
+            count=len(alerts),
+            generated=generated or datetime.utcnow().strftime('%Y-%m-%d %H:%M:%S UTC')
+        ))
+
+        return "".join(parts)
     
-    def _create_html_email_body(self, alerts: List[Dict]) -> str:
+    def _create_html_email_body(self, alerts: List[Dict], generated: str = None) -> str:
         """
         Create HTML email body
-        
+
         Args:
             alerts: List of alert dictionaries
-        
+            generated: Precomputed generation timestamp (optional)
+
         Returns:
             HTML email body
         """
-        html = """
-        <html>
-        <head>
-            <style>
-                body { font-family: Arial, sans-serif; }
-                .header { background-color: #f44336; color: white; padding: 20px; text-align: center; }
-                .alert-box { background-color: #f9f9f9; border-left: 5px solid #f44336; margin: 20px 0; padding: 15px; }
-                .alert-high { border-left-color: #f44336; }
-                .alert-medium { border-left-color: #ff9800; }
-                .price { font-size: 24px; font-weight: bold; color: #333; }
-                .footer { margin-top: 30px; padding: 20px; background-color: #f0f0f0; text-align: center; font-size: 12px; }
-            </style>
-        </head>
-        <body>
-            <div class="header">
-                <h1>🚨 Market Price Alerts</h1>
-            </div>
-        """
-        
-        for alert in alerts:
-            severity_class = 'alert-high' if alert['severity'] == 'HIGH' else 'alert-medium'
-            
-            html += f"""
-            <div class="alert-box {severity_class}">
-                <h2>{alert['symbol']}</h2>
-                <p class="price">Current Price: ${alert['current_price']:.2f}</p>
-                <p><strong>Alert Type:</strong> {alert['threshold_type'].replace('_', ' ').title()}</p>
-                <p><strong>Threshold:</strong> ${alert['threshold_value']:.2f}</p>
-                <p><strong>Time:</strong> {alert['timestamp']}</p>
-            </div>
-            """
-        
-        html += f"""
-            <div class="footer">
-                <p>Total Alerts: {len(alerts)}</p>
-                <p>Generated: {datetime.utcnow().strftime('%Y-%m-%d %H:%M:%S UTC')}</p>
-                <p>Market Data Automation Tool</p>
-            </div>
-        </body>
-        </html>
-        """
-        
-        return html
+        parts = [_HTML_HEADER]
+        parts.extend(
+            _HTML_ALERT_TMPL.format(
+                severity_class='alert-high' if alert['severity'] == 'HIGH' else 'alert-medium',
+                symbol=alert['symbol'],
+                current_price=alert['current_price'],
+                alert_type=alert['threshold_type'].replace('_', ' ').title(),
+                threshold_value=alert['threshold_value'],
+                timestamp=alert['timestamp']
+            )
+            for alert in alerts
+        )
+        parts.append(_HTML_FOOTER_TMPL.format(
+            count=len(alerts),
+            generated=generated or datetime.utcnow().strftime('%Y-%m-%d %H:%M:%S UTC')
+        ))
+
+        return "".join(parts)
     
     def get_threshold_summary(self) -> str:
         """
@@ -291,21 +581,35 @@ class AlertManager:
         return summary
 
 
+# Shared manager for the convenience function: constructing one per call
+# would spawn a fresh SMTP worker thread and register new atexit hooks
+# every cycle in looped deployments
+_ALERT_MANAGER = None
+
+
+def _get_alert_manager() -> AlertManager:
+    """Return the shared AlertManager instance (created on first use)"""
+    global _ALERT_MANAGER
+    if _ALERT_MANAGER is None:
+        _ALERT_MANAGER = AlertManager()
+    return _ALERT_MANAGER
+
+
 # Convenience function
-def check_and_alert(quotes: List[Dict]) -> List[Dict]:
+def check_and_alert(quotes: Union[QuoteBatch, pd.DataFrame, List[Dict]]) -> List[Dict]:
     """
     Convenience function to check quotes and send alerts
-    
+
     Args:
-        quotes: List of quote dictionaries
-    
+        quotes: QuoteBatch, DataFrame, or list of quote dictionaries
+
     Returns:
         List of triggered alerts
     """
-    manager = AlertManager()
+    manager = _get_alert_manager()
     alerts = manager.check_multiple(quotes)
-    
+
     if alerts:
         manager.send_alerts(alerts)
-    
+
     return alerts
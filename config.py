@@ -43,6 +43,7 @@ class Config:
     SMTP_USERNAME = os.getenv('SMTP_USERNAME', '')
     SMTP_PASSWORD = os.getenv('SMTP_PASSWORD', '')
     ALERT_EMAIL_TO = os.getenv('ALERT_EMAIL_TO', '')
+    ALERT_EMAIL_HTML = os.getenv('ALERT_EMAIL_HTML', 'True').lower() == 'true'
     
     # Data Storage
     DATABASE_PATH = BASE_DIR / os.getenv('DATABASE_PATH', 'data/market_data.db')
@@ -55,6 +56,8 @@ class Config:
     # API Rate Limiting
     API_RETRY_ATTEMPTS = 3
     API_RETRY_DELAY = 2  # seconds
+    FETCH_MAX_WORKERS = int(os.getenv('FETCH_MAX_WORKERS', '16'))
+    QUOTE_CACHE_TTL = float(os.getenv('QUOTE_CACHE_TTL', '30'))  # seconds
     
     @classmethod
     def validate(cls):
@@ -3,10 +3,31 @@ Data Fetching Module
 Handles API calls to fetch market data from various providers
 """
 
+import asyncio
+import functools
 import logging
+import threading
 import time
+import pandas as pd
 import requests
 import yfinance as yf
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+# Prefer orjson (C-implemented) for parsing API responses; fall back to
+# the stdlib when it isn't installed
+try:
+    from orjson import loads as _json_loads
+except ImportError:
+    from json import loads as _json_loads
+
+# aiohttp enables the event-loop fetch path; the threaded path is used
+# when it isn't installed
+try:
+    import aiohttp
+except ImportError:
+    aiohttp = None
 from datetime import datetime
 from typing import Dict, List, Optional
 from config import Config
@@ -15,6 +36,203 @@ from config import Config
 logger = logging.getLogger(__name__)
 
 
+class _TokenBucket:
+    """
+    Token-bucket rate limiter for a provider
+
+    Allows short bursts up to the bucket capacity, then paces requests at
+    the refill rate. Thread-safe, so it can be shared by the fetch thread
+    pool and the event-loop fetcher.
+    """
+
+    def __init__(self, rate: float, capacity: int):
+        """
+        Args:
+            rate: Token refill rate in requests/second (inf = no limit)
+            capacity: Maximum burst size
+        """
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = float(capacity)
+        self._last_refill = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _reserve(self) -> float:
+        """
+        Take one token
+
+        Returns:
+            Seconds to wait before the request may proceed
+        """
+        if self.rate == float('inf'):
+            return 0.0
+
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.capacity, self._tokens + (now - self._last_refill) * self.rate)
+            self._last_refill = now
+            self._tokens -= 1.0
+
+            if self._tokens >= 0:
+                return 0.0
+
+            # Bucket overdrawn: wait until the deficit refills
+            return -self._tokens / self.rate
+
+    def acquire(self):
+        """Block until the next request is allowed"""
+        wait = self._reserve()
+        if wait > 0:
+            time.sleep(wait)
+
+    async def acquire_async(self):
+        """Async variant of acquire that yields to the event loop while waiting"""
+        wait = self._reserve()
+        if wait > 0:
+            await asyncio.sleep(wait)
+
+
+class QuoteBatch:
+    """
+    Column-oriented batch of quotes backed by a pandas DataFrame
+
+    Stores quote fields as columns instead of one dict per quote, so
+    downstream transform/alert code can operate vectorized. Iteration and
+    to_records() keep dict-per-quote compatibility for existing callers.
+    """
+
+    COLUMNS = ['symbol', 'price', 'volume', 'timestamp', 'provider']
+
+    def __init__(self, frame: pd.DataFrame = None):
+        """
+        Args:
+            frame: DataFrame with quote columns (empty batch if omitted)
+        """
+        if frame is None:
+            frame = pd.DataFrame(columns=self.COLUMNS)
+        self.frame = frame
+
+    @classmethod
+    def from_records(cls, records: List[Dict]) -> 'QuoteBatch':
+        """
+        Build a batch from a list of quote dictionaries
+
+        Args:
+            records: List of quote dictionaries
+
+        Returns:
+            QuoteBatch with one row per quote
+        """
+        if not records:
+            return cls()
+        return cls(pd.DataFrame(records))
+
+    def to_records(self) -> List[Dict]:
+        """Return the batch as a list of quote dictionaries"""
+        return self.frame.to_dict('records')
+
+    def __len__(self):
+        return len(self.frame)
+
+    def __bool__(self):
+        return not self.frame.empty
+
+    def __iter__(self):
+        return iter(self.to_records())
+
+
+# Per-provider rate limits: yfinance has no strict limit, Alpha Vantage's
+# free tier allows 5 requests/minute (burstable up to 5 at once)
+_BUCKETS = {
+    'yfinance': _TokenBucket(rate=float('inf'), capacity=1),
+    'alphavantage': _TokenBucket(rate=5 / 60, capacity=5),
+}
+
+# Price/volume fields to probe in preference order - yfinance's info
+# schema varies between asset types and library versions
+_PRICE_KEYS = ('currentPrice', 'regularMarketPrice', 'price', 'previousClose')
+_VOLUME_KEYS = ('volume', 'regularMarketVolume')
+
+# Field names seen in Alpha Vantage bulk quote rows
+_BULK_PRICE_KEYS = ('close', 'price', '05. price')
+_BULK_VOLUME_KEYS = ('volume', '06. volume')
+
+
+def _is_crypto(symbol: str) -> bool:
+    """
+    Determine whether a symbol refers to a cryptocurrency
+
+    Args:
+        symbol: Stock/crypto symbol
+
+    Returns:
+        True if the symbol looks like a crypto pair
+    """
+    return '-' in symbol or 'BTC' in symbol or 'ETH' in symbol
+
+
+@functools.lru_cache(maxsize=256)
+def _ticker(symbol: str) -> yf.Ticker:
+    """
+    Return a cached yfinance Ticker for a symbol
+
+    A monitor loop polls the same symbols repeatedly; reusing the Ticker
+    avoids rebuilding its internal state (and session warmup) per poll.
+
+    Args:
+        symbol: Stock/crypto symbol
+
+    Returns:
+        Cached Ticker instance
+    """
+    return yf.Ticker(symbol)
+
+
+def _build_quote(symbol: str, price, volume, timestamp: str, provider: str) -> Dict:
+    """
+    Build a quote dictionary from already-extracted scalar fields
+
+    Single shared hot-path constructor for all providers, with the
+    float/int coercion done once here.
+
+    Args:
+        symbol: Symbol the quote is for
+        price: Raw price value (coerced to float)
+        volume: Raw volume value (coerced to int, defaults to 0)
+        timestamp: ISO timestamp string
+        provider: Provider name
+
+    Returns:
+        Quote dictionary
+    """
+    return {
+        'symbol': symbol,
+        'price': float(price) if price is not None else None,
+        'volume': int(volume) if volume else 0,
+        'timestamp': timestamp,
+        'provider': provider
+    }
+
+
+def _probe_keys(mapping: Dict, keys) -> Optional[object]:
+    """
+    Return the first non-None value for any of the given keys
+
+    Args:
+        mapping: Dictionary to probe
+        keys: Keys to try, in preference order
+
+    Returns:
+        First non-None value found, or None
+    """
+    get = mapping.get
+    for key in keys:
+        value = get(key)
+        if value is not None:
+            return value
+    return None
+
+
 class MarketDataFetcher:
     """
     Fetches market data from public APIs
@@ -32,8 +250,90 @@ class MarketDataFetcher:
         self.api_key = Config.API_KEY
         self.retry_attempts = Config.API_RETRY_ATTEMPTS
         self.retry_delay = Config.API_RETRY_DELAY
-        
+
+        # TTL cache so back-to-back polls don't re-hit the upstream API
+        self._cache = {}  # symbol -> (monotonic fetch time, quote dict)
+        self._cache_ttl = Config.QUOTE_CACHE_TTL
+        self._cache_lock = threading.Lock()
+
+        # Persistent HTTP session with keep-alive and connection pooling,
+        # so back-to-back API calls reuse TCP+TLS connections
+        self.session = requests.Session()
+        adapter = HTTPAdapter(
+            pool_connections=8,
+            pool_maxsize=16,
+            max_retries=Retry(total=3, backoff_factor=0.5, status_forcelist=[429, 500, 502, 503, 504])
+        )
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
+
         logger.info(f"Initialized MarketDataFetcher with provider: {self.provider}")
+
+    def close(self):
+        """Close the HTTP session and its connection pool"""
+        self.session.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def _get_cached(self, symbol: str) -> Optional[Dict]:
+        """
+        Return a cached quote for a symbol if it's still fresh
+
+        Args:
+            symbol: Symbol to look up
+
+        Returns:
+            Copy of the cached quote (original fetch timestamp), or None
+        """
+        if self._cache_ttl <= 0:
+            return None
+
+        with self._cache_lock:
+            cached = self._cache.get(symbol)
+
+        if cached is None:
+            return None
+
+        fetched_at, quote = cached
+        if time.monotonic() - fetched_at >= self._cache_ttl:
+            return None
+
+        # Keep the original fetch timestamp: the price is from that
+        # moment, and the database's UNIQUE(symbol, timestamp) constraint
+        # then dedupes re-saves of cache-served quotes. A copy is still
+        # returned so callers can't mutate the cached entry.
+        logger.debug(f"Cache hit for {symbol}")
+        return dict(quote)
+
+    def _store_in_cache(self, quote: Dict):
+        """
+        Store a freshly fetched quote in the cache
+
+        Args:
+            quote: Quote dictionary to cache
+        """
+        if self._cache_ttl <= 0:
+            return
+
+        with self._cache_lock:
+            self._cache[quote['symbol']] = (time.monotonic(), quote)
+
+    def invalidate(self, symbol: str = None):
+        """
+        Drop cached quotes to force a fresh fetch
+
+        Args:
+            symbol: Symbol to invalidate (clears the whole cache if omitted)
+        """
+        with self._cache_lock:
+            if symbol is None:
+                self._cache.clear()
+            else:
+                self._cache.pop(symbol, None)
     
     def fetch_quote(self, symbol: str) -> Optional[Dict]:
         """
@@ -45,14 +345,25 @@ class MarketDataFetcher:
         Returns:
             Dictionary containing quote data or None if failed
         """
+        cached = self._get_cached(symbol)
+        if cached is not None:
+            return cached
+
         logger.info(f"Fetching quote for {symbol}")
-        
+
+        rate_limiter = _BUCKETS.get(self.provider, _BUCKETS['yfinance'])
+
         for attempt in range(self.retry_attempts):
             try:
+                rate_limiter.acquire()
+
                 if self.provider == 'alphavantage':
-                    return self._fetch_alphavantage(symbol)
+                    quote = self._fetch_alphavantage(symbol)
                 else:  # yfinance (default)
-                    return self._fetch_yfinance(symbol)
+                    quote = self._fetch_yfinance(symbol)
+
+                self._store_in_cache(quote)
+                return quote
             
             except requests.exceptions.RequestException as e:
                 logger.warning(f"Network error on attempt {attempt + 1}/{self.retry_attempts}: {e}")
@@ -79,38 +390,25 @@ class MarketDataFetcher:
             Dictionary with quote data
         """
         try:
-            ticker = yf.Ticker(symbol)
+            ticker = _ticker(symbol)
             info = ticker.info
             
             # Get current price - try multiple fields as yfinance structure can vary
-            current_price = (
-                info.get('currentPrice') or 
-                info.get('regularMarketPrice') or 
-                info.get('price') or
-                info.get('previousClose')
-            )
-            
+            current_price = _probe_keys(info, _PRICE_KEYS)
+
             if current_price is None:
                 # Try getting it from history
                 hist = ticker.history(period='1d')
                 if not hist.empty:
                     current_price = hist['Close'].iloc[-1]
-            
-            # Get volume
-            volume = (
-                info.get('volume') or 
-                info.get('regularMarketVolume') or 
-                0
+
+            volume = _probe_keys(info, _VOLUME_KEYS)
+
+            quote_data = _build_quote(
+                symbol, current_price, volume,
+                datetime.utcnow().isoformat(), 'yfinance'
             )
-            
-            quote_data = {
-                'symbol': symbol,
-                'price': float(current_price) if current_price else None,
-                'volume': int(volume) if volume else 0,
-                'timestamp': datetime.utcnow().isoformat(),
-                'provider': 'yfinance'
-            }
-            
+
             logger.info(f"Successfully fetched {symbol}: ${quote_data['price']}")
             return quote_data
         
@@ -118,29 +416,86 @@ class MarketDataFetcher:
             logger.error(f"Error fetching from yfinance for {symbol}: {e}")
             raise
     
-    def _fetch_alphavantage(self, symbol: str) -> Dict:
+    def _fetch_yfinance_batch(self, symbols: List[str]) -> List[Dict]:
         """
-        Fetch data using Alpha Vantage API
-        
+        Fetch data for multiple symbols with a single yfinance download
+
+        Avoids the heavy per-symbol `.info` request by pulling price and
+        volume for all symbols in one multi-ticker response.
+
+        Args:
+            symbols: List of stock/crypto symbols
+
+        Returns:
+            List of quote dictionaries (symbols that failed are omitted)
+        """
+        data = yf.download(
+            symbols,
+            period='1d',
+            group_by='ticker',
+            threads=True,
+            progress=False
+        )
+
+        if data is None or data.empty:
+            raise ValueError(f"No data returned for batch download of {symbols}")
+
+        results = []
+        for symbol in symbols:
+            try:
+                # With group_by='ticker' columns are (symbol, field);
+                # a single-symbol download returns flat columns
+                if len(symbols) > 1:
+                    symbol_data = data[symbol]
+                else:
+                    symbol_data = data
+
+                closes = symbol_data['Close'].dropna()
+                if closes.empty:
+                    logger.warning(f"No price data in batch response for {symbol}")
+                    continue
+
+                volumes = symbol_data['Volume'].dropna()
+                volume = volumes.iloc[-1] if not volumes.empty else 0
+
+                quote_data = _build_quote(
+                    symbol, closes.iloc[-1], volume,
+                    datetime.utcnow().isoformat(), 'yfinance'
+                )
+
+                logger.info(f"Successfully fetched {symbol}: ${quote_data['price']}")
+                results.append(quote_data)
+
+            except Exception as e:
+                logger.warning(f"Error parsing batch data for {symbol}: {e}")
+                continue
+
+        return results
+
+    def _alphavantage_request(self, symbol: str):
+        """
+        Build the Alpha Vantage request for a symbol
+
         Args:
             symbol: Stock/crypto symbol
-        
+
         Returns:
-            Dictionary with quote data
+            Tuple of (url, params, is_crypto)
         """
         if not self.api_key:
             raise ValueError("Alpha Vantage API key is required")
-        
+
         # Determine if it's crypto or stock
-        is_crypto = '-' in symbol or 'BTC' in symbol or 'ETH' in symbol
-        
+        is_crypto = _is_crypto(symbol)
+
+        url = 'https://www.alphavantage.co/query'
+
         if is_crypto:
             # For crypto, symbol format is "BTC-USD" -> from_currency=BTC, to_currency=USD
             parts = symbol.split('-')
             from_currency = parts[0]
             to_currency = parts[1] if len(parts) > 1 else 'USD'
-            
-            url = 'https://www.alphavantage.co/query'
+
             params = {
                 'function': 'CURRENCY_EXCHANGE_RATE',
                 'from_currency': from_currency,
@@ -149,84 +504,339 @@ class MarketDataFetcher:
             }
         else:
             # Stock quote
-            url = 'https://www.alphavantage.co/query'
             params = {
                 'function': 'GLOBAL_QUOTE',
                 'symbol': symbol,
                 'apikey': self.api_key
             }
-        
-        response = requests.get(url, params=params, timeout=10)
+
+        return url, params, is_crypto
+
+    def _fetch_alphavantage(self, symbol: str) -> Dict:
+        """
+        Fetch data using Alpha Vantage API
+
+        Args:
+            symbol: Stock/crypto symbol
+
+        Returns:
+            Dictionary with quote data
+        """
+        url, params, is_crypto = self._alphavantage_request(symbol)
+
+        response = self.session.get(url, params=params, timeout=10)
         response.raise_for_status()
-        data = response.json()
-        
-        # Parse response based on type
+        data = _json_loads(response.content)
+
+        return self._parse_alphavantage(symbol, data, is_crypto)
+
+    def _parse_alphavantage(self, symbol: str, data: Dict, is_crypto: bool) -> Dict:
+        """
+        Parse an Alpha Vantage response into a quote dictionary
+
+        Args:
+            symbol: Symbol the response is for
+            data: Decoded JSON response
+            is_crypto: Whether the response is a crypto exchange rate
+
+        Returns:
+            Dictionary with quote data
+        """
         if is_crypto:
             if 'Realtime Currency Exchange Rate' in data:
                 rate_data = data['Realtime Currency Exchange Rate']
-                quote_data = {
-                    'symbol': symbol,
-                    'price': float(rate_data['5. Exchange Rate']),
-                    'volume': 0,  # Alpha Vantage doesn't provide volume for crypto exchange rates
-                    'timestamp': datetime.utcnow().isoformat(),
-                    'provider': 'alphavantage'
-                }
+                # Alpha Vantage doesn't provide volume for crypto exchange rates
+                quote_data = _build_quote(
+                    symbol, rate_data['5. Exchange Rate'], 0,
+                    datetime.utcnow().isoformat(), 'alphavantage'
+                )
             else:
                 raise ValueError(f"Unexpected response format: {data}")
         else:
             if 'Global Quote' in data and data['Global Quote']:
                 quote = data['Global Quote']
-                quote_data = {
-                    'symbol': symbol,
-                    'price': float(quote['05. price']),
-                    'volume': int(quote.get('06. volume', 0)),
-                    'timestamp': datetime.utcnow().isoformat(),
-                    'provider': 'alphavantage'
-                }
+                quote_data = _build_quote(
+                    symbol, quote['05. price'], quote.get('06. volume', 0),
+                    datetime.utcnow().isoformat(), 'alphavantage'
+                )
             else:
                 raise ValueError(f"No quote data returned for {symbol}. Response: {data}")
         
         logger.info(f"Successfully fetched {symbol}: ${quote_data['price']}")
         return quote_data
     
-    def fetch_multiple(self, symbols: List[str]) -> List[Dict]:
+    def fetch_multiple(self, symbols: List[str]) -> QuoteBatch:
         """
         Fetch quotes for multiple symbols
-        
+
         Args:
             symbols: List of symbols to fetch
-        
+
         Returns:
-            List of quote dictionaries
+            QuoteBatch with one row per fetched quote
         """
         logger.info(f"Fetching quotes for {len(symbols)} symbols")
-        
-        results = []
-        for symbol in symbols:
-            quote = self.fetch_quote(symbol)
-            if quote:
-                results.append(quote)
-            
-            # Add small delay to respect API rate limits
-            time.sleep(0.5)
-        
+
+        if not symbols:
+            return QuoteBatch()
+
+        # yfinance supports multi-symbol downloads: one HTTP roundtrip
+        # for the whole batch instead of one (or two) per symbol
+        if self.provider == 'yfinance':
+            # Serve what we can from the TTL cache first
+            quotes = {}
+            for symbol in symbols:
+                cached = self._get_cached(symbol)
+                if cached is not None:
+                    quotes[symbol] = cached
+
+            uncached = [s for s in symbols if s not in quotes]
+
+            batch_results = []
+            if uncached:
+                try:
+                    batch_results = self._fetch_yfinance_batch(uncached)
+                except Exception as e:
+                    logger.warning(f"Batch fetch failed, falling back to per-symbol: {e}")
+
+            for quote in batch_results:
+                self._store_in_cache(quote)
+                quotes[quote['symbol']] = quote
+
+            missing = [s for s in symbols if s not in quotes]
+
+            # Retry any symbols the batch response didn't cover individually
+            if missing and quotes:
+                logger.info(f"Batch fetch missed {len(missing)} symbols, retrying individually")
+
+            if missing:
+                for quote in self._fetch_concurrently(missing):
+                    quotes[quote['symbol']] = quote
+
+            results = [quotes[symbol] for symbol in symbols if symbol in quotes]
+            logger.info(f"Successfully fetched {len(results)}/{len(symbols)} quotes")
+            return QuoteBatch.from_records(results)
+
+        if self.provider == 'alphavantage':
+            # Serve what we can from the TTL cache first
+            quotes = {}
+            for symbol in symbols:
+                cached = self._get_cached(symbol)
+                if cached is not None:
+                    quotes[symbol] = cached
+
+            # Stocks can come back in a single bulk request; crypto pairs
+            # still need per-symbol CURRENCY_EXCHANGE_RATE calls
+            stock_syms = [s for s in symbols if s not in quotes and not _is_crypto(s)]
+            if len(stock_syms) > 1:
+                try:
+                    for quote in self._fetch_alphavantage_bulk(stock_syms):
+                        self._store_in_cache(quote)
+                        quotes[quote['symbol']] = quote
+                except Exception as e:
+                    logger.warning(f"Bulk quote fetch failed, falling back to per-symbol: {e}")
+
+            missing = [s for s in symbols if s not in quotes]
+            for quote in self._fetch_per_symbol(missing):
+                quotes[quote['symbol']] = quote
+
+            results = [quotes[symbol] for symbol in symbols if symbol in quotes]
+            logger.info(f"Successfully fetched {len(results)}/{len(symbols)} quotes")
+            return QuoteBatch.from_records(results)
+
+        results = self._fetch_concurrently(symbols)
         logger.info(f"Successfully fetched {len(results)}/{len(symbols)} quotes")
+        return QuoteBatch.from_records(results)
+
+    def _fetch_per_symbol(self, symbols: List[str]) -> List[Dict]:
+        """
+        Fetch symbols one request each, preferring the event-loop fetcher
+
+        Args:
+            symbols: List of symbols to fetch
+
+        Returns:
+            List of quote dictionaries
+        """
+        if not symbols:
+            return []
+
+        # The event-loop fetcher shares keep-alive connections on one OS
+        # thread with no per-request thread churn
+        if aiohttp is not None:
+            try:
+                return asyncio.run(self._afetch_all(symbols))
+            except Exception as e:
+                logger.warning(f"Async fetch failed, falling back to threaded fetch: {e}")
+
+        return self._fetch_concurrently(symbols)
+
+    def _fetch_alphavantage_bulk(self, symbols: List[str]) -> List[Dict]:
+        """
+        Fetch multiple stock quotes with a single bulk Alpha Vantage request
+
+        Uses the REALTIME_BULK_QUOTES endpoint (comma-separated symbols),
+        collapsing N roundtrips - each subject to the 5 req/min free-tier
+        limit - into one.
+
+        Args:
+            symbols: List of stock symbols (no crypto pairs)
+
+        Returns:
+            List of quote dictionaries (symbols missing from the response
+            are omitted)
+        """
+        if not self.api_key:
+            raise ValueError("Alpha Vantage API key is required")
+
+        _BUCKETS['alphavantage'].acquire()
+
+        params = {
+            'function': 'REALTIME_BULK_QUOTES',
+            'symbol': ','.join(symbols),
+            'apikey': self.api_key
+        }
+
+        response = self.session.get('https://www.alphavantage.co/query', params=params, timeout=10)
+        response.raise_for_status()
+        data = _json_loads(response.content)
+
+        rows = data.get('data')
+        if not rows:
+            raise ValueError(f"No bulk quote data returned for {symbols}. Response: {data}")
+
+        now_iso = datetime.utcnow().isoformat()
+        results = []
+
+        for row in rows:
+            symbol = row.get('symbol')
+            price = _probe_keys(row, _BULK_PRICE_KEYS)
+
+            if not symbol or price is None:
+                logger.warning(f"Skipping malformed bulk quote row: {row}")
+                continue
+
+            quote_data = _build_quote(
+                symbol, price, _probe_keys(row, _BULK_VOLUME_KEYS),
+                now_iso, 'alphavantage'
+            )
+
+            logger.info(f"Successfully fetched {symbol}: ${quote_data['price']}")
+            results.append(quote_data)
+
         return results
 
+    async def _afetch_all(self, symbols: List[str]) -> List[Dict]:
+        """
+        Fetch all symbols concurrently on the asyncio event loop
+
+        Args:
+            symbols: List of symbols to fetch
+
+        Returns:
+            List of quote dictionaries in requested order
+        """
+        connector = aiohttp.TCPConnector(limit=32, keepalive_timeout=60)
+
+        async with aiohttp.ClientSession(connector=connector) as session:
+            quotes = await asyncio.gather(
+                *(self._afetch_quote(session, symbol) for symbol in symbols)
+            )
+
+        return [quote for quote in quotes if quote]
+
+    async def _afetch_quote(self, session, symbol: str) -> Optional[Dict]:
+        """
+        Fetch a single quote over an aiohttp session
+
+        Mirrors fetch_quote: TTL cache, rate limiting, and retries on
+        network errors.
+
+        Args:
+            session: Shared aiohttp.ClientSession
+            symbol: Symbol to fetch
+
+        Returns:
+            Quote dictionary or None if failed
+        """
+        cached = self._get_cached(symbol)
+        if cached is not None:
+            return cached
+
+        logger.info(f"Fetching quote for {symbol}")
+
+        rate_limiter = _BUCKETS.get(self.provider, _BUCKETS['yfinance'])
+
+        for attempt in range(self.retry_attempts):
+            try:
+                await rate_limiter.acquire_async()
+
+                url, params, is_crypto = self._alphavantage_request(symbol)
+                timeout = aiohttp.ClientTimeout(total=10)
+                async with session.get(url, params=params, timeout=timeout) as response:
+                    response.raise_for_status()
+                    data = _json_loads(await response.read())
+
+                quote = self._parse_alphavantage(symbol, data, is_crypto)
+                self._store_in_cache(quote)
+                return quote
+
+            except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                logger.warning(f"Network error on attempt {attempt + 1}/{self.retry_attempts}: {e}")
+                if attempt < self.retry_attempts - 1:
+                    await asyncio.sleep(self.retry_delay)
+                else:
+                    logger.error(f"Failed to fetch {symbol} after {self.retry_attempts} attempts")
+                    return None
+
+            except Exception as e:
+                logger.error(f"Unexpected error fetching {symbol}: {e}")
+                return None
+
+        return None
+
+    def _fetch_concurrently(self, symbols: List[str]) -> List[Dict]:
+        """
+        Fetch quotes one symbol at a time using the thread pool
+
+        Args:
+            symbols: List of symbols to fetch
+
+        Returns:
+            List of quote dictionaries in requested order
+        """
+        # Fetch concurrently - the work is I/O-bound, so a thread pool
+        # overlaps the network round-trips (rate limiting is handled
+        # per-provider in fetch_quote)
+        quotes = {}
+        max_workers = min(Config.FETCH_MAX_WORKERS, len(symbols))
+
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            futures = {executor.submit(self.fetch_quote, symbol): symbol for symbol in symbols}
+
+            for future in as_completed(futures):
+                symbol = futures[future]
+                quote = future.result()
+                if quote:
+                    quotes[symbol] = quote
+
+        # Preserve the order symbols were requested in
+        return [quotes[symbol] for symbol in symbols if symbol in quotes]
+
 
 # Convenience function
-def fetch_market_data(symbols: List[str] = None) -> List[Dict]:
+def fetch_market_data(symbols: List[str] = None) -> QuoteBatch:
     """
     Convenience function to fetch market data for configured symbols
-    
+
     Args:
         symbols: List of symbols (uses Config.SYMBOLS if not provided)
-    
+
     Returns:
-        List of quote dictionaries
+        QuoteBatch with fetched quotes
     """
     if symbols is None:
         symbols = Config.SYMBOLS
     
-    fetcher = MarketDataFetcher()
-    return fetcher.fetch_multiple(symbols)
+    with MarketDataFetcher() as fetcher:
+        return fetcher.fetch_multiple(symbols)
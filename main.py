@@ -14,7 +14,7 @@ sys.path.insert(0, str(Path(__file__).parent))
 from fetch_data import fetch_market_data
 from transform_data import transform_market_data
 from storage import DataStorage, save_data
-from alerts import AlertManager, check_and_alert
+from alerts import check_and_alert
 from config import Config
 
 # Configure logging
@@ -41,9 +41,10 @@ class MarketDataAutomation:
         logger.info("Market Data Automation Tool - Starting")
         logger.info("="*70)
         
+        # Alerts go through check_and_alert's shared manager - building
+        # one here too would spawn a second SMTP worker and connection
         self.storage = DataStorage()
-        self.alert_manager = AlertManager()
-        
+
         # Display configuration
         self._display_configuration()
     
@@ -86,22 +87,25 @@ class MarketDataAutomation:
             
             logger.info(f"✓ Fetched {len(raw_data)} quotes")
             
-            # Step 2: Transform data
+            # Step 2: Transform data (duplicates against history are
+            # handled by the database's UNIQUE(symbol, timestamp)
+            # constraint at save time, so no need to load it all here).
+            # The run only persists the cleaned data, so take it as
+            # insert-ready tuples and skip the DataFrame intermediate.
             logger.info("\nStep 2/5: Transforming data...")
-            existing_data = self.storage.load_from_database()
-            clean_data = transform_market_data(raw_data, existing_data)
-            
-            if clean_data.empty:
+            clean_records = transform_market_data(raw_data, as_records=True)
+
+            if not clean_records:
                 logger.info("No new data to process (all duplicates or invalid)")
                 # Still check alerts with raw data
                 check_and_alert(raw_data)
                 return True
-            
-            logger.info(f"✓ Cleaned {len(clean_data)} records")
-            
+
+            logger.info(f"✓ Cleaned {len(clean_records)} records")
+
             # Step 3: Save data
             logger.info("\nStep 3/5: Saving data...")
-            saved_count = save_data(clean_data)
+            saved_count = save_data(clean_records)
             logger.info(f"✓ Saved {saved_count} records to database and CSV")
             
             # Step 4: Check alerts
@@ -3,9 +3,12 @@ Data Storage Module
 Handles SQLite database and CSV file operations
 """
 
+import csv
 import logging
 import sqlite3
+import numpy as np
 import pandas as pd
+from datetime import datetime, timedelta
 from pathlib import Path
 from typing import Optional
 from config import Config
@@ -13,6 +16,89 @@ from config import Config
 # Configure logging
 logger = logging.getLogger(__name__)
 
+# Rows per executemany call - keeps per-call argument lists bounded
+# while still amortizing statement dispatch over large batches
+INSERT_CHUNK_ROWS = 10_000
+
+# Rows per chunk when streaming full-table CSV exports
+EXPORT_CHUNK_ROWS = 50_000
+
+# Let sqlite3 bind NumPy scalars directly, so insert rows can be built
+# straight from column arrays without converting each cell in Python
+sqlite3.register_adapter(np.int64, int)
+sqlite3.register_adapter(np.float64, float)
+
+# Optional: back query results with Arrow buffers when pyarrow is
+# installed - strings stay in shared buffers instead of one Python
+# object per cell. Falls back to the default NumPy backend without it.
+try:
+    import pyarrow  # noqa: F401
+    _READ_SQL_KWARGS = {'dtype_backend': 'pyarrow'}
+except ImportError:
+    _READ_SQL_KWARGS = {}
+
+# Hot statements as shared literals: every caller passes the exact same
+# string, so the connection's prepared-statement cache always hits
+_INSERT_SQL = '''
+    INSERT OR IGNORE INTO market_data
+    (symbol, price, volume, timestamp, provider, processed_at)
+    VALUES (?, ?, ?, ?, ?, ?)
+'''
+
+_LATEST_PRICES_SQL = '''
+    SELECT symbol, price, volume, timestamp, provider
+    FROM (
+        SELECT symbol, price, volume, timestamp, provider,
+               ROW_NUMBER() OVER (
+                   PARTITION BY symbol
+                   ORDER BY timestamp DESC
+               ) AS rn
+        FROM market_data
+    )
+    WHERE rn = 1
+    ORDER BY symbol
+'''
+
+_EXPORT_SQL = '''
+    SELECT symbol, price, volume, timestamp, provider, processed_at
+    FROM market_data
+    ORDER BY timestamp DESC
+'''
+
+# Databases already tuned this process - WAL mode persists in the file,
+# so repeated DataStorage() constructions skip re-applying the pragmas
+_TUNED_DBS = set()
+
+
+def _apply_pragmas(conn: sqlite3.Connection, db_path):
+    """
+    Apply WAL journaling and performance pragmas to a database
+
+    WAL lets readers and the writer run concurrently, and
+    synchronous=NORMAL drops the per-commit fsync (safe under WAL).
+
+    Args:
+        conn: Open connection to the database
+        db_path: Path of the database (used to apply only once)
+    """
+    key = str(db_path)
+    if key == ':memory:':
+        return
+
+    cursor = conn.cursor()
+
+    # WAL mode persists in the database file - only switch it once
+    if key not in _TUNED_DBS:
+        cursor.execute("PRAGMA journal_mode=WAL")
+        _TUNED_DBS.add(key)
+        logger.info("Applied WAL mode and performance pragmas")
+
+    # The rest are per-connection settings
+    cursor.execute("PRAGMA synchronous=NORMAL")
+    cursor.execute("PRAGMA temp_store=MEMORY")
+    cursor.execute("PRAGMA cache_size=-65536")   # 64 MB page cache
+    cursor.execute("PRAGMA mmap_size=268435456")  # 256 MB mmap window
+
 
 class DataStorage:
     """
@@ -33,47 +119,72 @@ class DataStorage:
         # Ensure parent directories exist
         self.db_path.parent.mkdir(parents=True, exist_ok=True)
         self.csv_path.parent.mkdir(parents=True, exist_ok=True)
-        
+
+        # One long-lived connection shared by all methods: avoids the
+        # per-call connection setup (pragmas, schema cache, WAL machinery).
+        # isolation_level=None puts sqlite3 in autocommit mode; write paths
+        # manage transactions explicitly.
+        self._conn = sqlite3.connect(
+            self.db_path,
+            check_same_thread=False,
+            isolation_level=None,
+            cached_statements=256
+        )
+        _apply_pragmas(self._conn, self.db_path)
+
         # Initialize database
         self._initialize_database()
-        
+
         logger.info(f"Storage initialized: DB={self.db_path}, CSV={self.csv_path}")
-    
+
+    def close(self):
+        """Close the database connection"""
+        self._conn.close()
+
     def _initialize_database(self):
         """Create database table if it doesn't exist"""
         try:
-            with sqlite3.connect(self.db_path) as conn:
-                cursor = conn.cursor()
-                
-                # Create market_data table
-                cursor.execute('''
-                    CREATE TABLE IF NOT EXISTS market_data (
-                        id INTEGER PRIMARY KEY AUTOINCREMENT,
-                        symbol TEXT NOT NULL,
-                        price REAL NOT NULL,
-                        volume INTEGER DEFAULT 0,
-                        timestamp TEXT NOT NULL,
-                        provider TEXT,
-                        processed_at TEXT,
-                        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                        UNIQUE(symbol, timestamp)
-                    )
-                ''')
-                
-                # Create index for faster queries
-                cursor.execute('''
-                    CREATE INDEX IF NOT EXISTS idx_symbol_timestamp 
-                    ON market_data(symbol, timestamp)
-                ''')
-                
-                cursor.execute('''
-                    CREATE INDEX IF NOT EXISTS idx_timestamp 
-                    ON market_data(timestamp)
-                ''')
-                
-                conn.commit()
-                logger.info("Database initialized successfully")
-        
+            cursor = self._conn.cursor()
+
+            # Create market_data table
+            cursor.execute('''
+                CREATE TABLE IF NOT EXISTS market_data (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    symbol TEXT NOT NULL,
+                    price REAL NOT NULL,
+                    volume INTEGER DEFAULT 0,
+                    timestamp TEXT NOT NULL,
+                    provider TEXT,
+                    processed_at TEXT,
+                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                    UNIQUE(symbol, timestamp)
+                )
+            ''')
+
+            # UNIQUE(symbol, timestamp) already maintains an implicit
+            # index on those columns, so the old explicit
+            # idx_symbol_timestamp duplicated every B-tree update on
+            # insert. Drop it from databases created before this change.
+            cursor.execute("DROP INDEX IF EXISTS idx_symbol_timestamp")
+
+            cursor.execute('''
+                CREATE INDEX IF NOT EXISTS idx_timestamp
+                ON market_data(timestamp)
+            ''')
+
+            # Covering index for the streaming CSV export: it includes
+            # every column _EXPORT_SQL selects (processed_at too), so the
+            # planner answers the query from one sequential index scan
+            # with no per-row table lookup. An earlier definition missed
+            # processed_at and was never picked - drop it on upgrade.
+            cursor.execute("DROP INDEX IF EXISTS idx_ts_cover")
+            cursor.execute('''
+                CREATE INDEX IF NOT EXISTS idx_ts_export
+                ON market_data(timestamp DESC, symbol, price, volume, provider, processed_at)
+            ''')
+
+            logger.info("Database initialized successfully")
+
         except Exception as e:
             logger.error(f"Error initializing database: {e}")
             raise
@@ -81,85 +192,176 @@ class DataStorage:
     def save_to_database(self, df: pd.DataFrame) -> int:
         """
         Save DataFrame to SQLite database
-        
+
+        Inserts with INSERT OR IGNORE executemany in chunks, so duplicate
+        rows are skipped server-side in one transaction - no string-built
+        multi-value INSERT, no IntegrityError-triggered fallback.
+
         Args:
             df: DataFrame to save
-        
+
         Returns:
-            Number of records saved
+            Number of records actually saved (duplicates excluded)
         """
         if df.empty:
             logger.info("No data to save to database")
             return 0
-        
+
+        # Fill defaults vectorially, once per batch
+        df = df.copy()
+
+        # Transformed frames carry symbol/provider as categoricals; cast
+        # back to plain strings so fillna and the sqlite3 driver see str
+        for col in ('symbol', 'provider'):
+            if col in df.columns and isinstance(df[col].dtype, pd.CategoricalDtype):
+                df[col] = df[col].astype(str)
+
+        if 'provider' not in df.columns:
+            df['provider'] = 'unknown'
+        else:
+            df['provider'] = df['provider'].fillna('unknown')
+
+        # One clock read per batch, shared by both default branches
+        now_iso = pd.Timestamp.utcnow().isoformat()
+
+        if 'processed_at' not in df.columns:
+            df['processed_at'] = now_iso
+        else:
+            df['processed_at'] = df['processed_at'].fillna(now_iso)
+
+        # Insert in (symbol, timestamp) order - the UNIQUE constraint's
+        # B-tree then fills sequentially instead of dirtying a random
+        # leaf page per row. The frame keeps its display order upstream;
+        # only this local copy is reordered.
+        df = df.sort_values(['symbol', 'timestamp'])
+
+        # Pull each column out as an array once and zip them into rows -
+        # column-wise extraction instead of walking the frame row by row
+        cols = [
+            df['symbol'].to_numpy(),
+            df['price'].to_numpy(dtype=np.float64),
+            df['volume'].to_numpy(dtype=np.int64),
+            df['timestamp'].to_numpy(),
+            df['provider'].to_numpy(),
+            df['processed_at'].to_numpy(),
+        ]
+        rows = list(zip(*cols))
+
+        cursor = self._conn.cursor()
+        saved_count = 0
+
         try:
-            with sqlite3.connect(self.db_path) as conn:
-                # Use 'replace' to handle duplicates (based on UNIQUE constraint)
-                records_saved = df.to_sql(
-                    'market_data',
-                    conn,
-                    if_exists='append',
-                    index=False,
-                    method='multi'
-                )
-                
-                logger.info(f"Saved {len(df)} records to database")
-                return len(df)
-        
-        except sqlite3.IntegrityError as e:
-            # Handle duplicate entries
-            logger.warning(f"Duplicate entries detected, using individual inserts: {e}")
-            return self._save_with_ignore_duplicates(df)
-        
+            cursor.execute("BEGIN IMMEDIATE")
+
+            for start in range(0, len(rows), INSERT_CHUNK_ROWS):
+                cursor.executemany(_INSERT_SQL, rows[start:start + INSERT_CHUNK_ROWS])
+
+                # rowcount only counts rows actually inserted, not ignored ones
+                saved_count += max(cursor.rowcount, 0)
+
+            cursor.execute("COMMIT")
+            logger.info(f"Saved {saved_count}/{len(df)} records to database (duplicates skipped)")
+
         except Exception as e:
+            # Only roll back if BEGIN actually got us into a transaction -
+            # the connection runs in autocommit (isolation_level=None), so
+            # a bare ROLLBACK outside one would raise its own error
+            if self._conn.in_transaction:
+                cursor.execute("ROLLBACK")
             logger.error(f"Error saving to database: {e}")
             raise
-    
-    def _save_with_ignore_duplicates(self, df: pd.DataFrame) -> int:
+
+        return saved_count
+
+    def filter_new_records(self, records: list) -> list:
         """
-        Save records individually, ignoring duplicates
-        
+        Return only the records whose (symbol, timestamp) is not yet stored
+
+        Also drops in-batch duplicate keys, so the result mirrors exactly
+        what an INSERT OR IGNORE save would add - callers use it to keep
+        the CSV export in step with the database.
+
         Args:
-            df: DataFrame to save
-        
+            records: List of 6-tuples in insert column order
+
         Returns:
-            Number of records actually saved
+            Records that an INSERT OR IGNORE save would actually insert
         """
+        if not records:
+            return []
+
+        seen = set()
+        unique = []
+        for record in records:
+            key = (record[0], record[3])
+            if key not in seen:
+                seen.add(key)
+                unique.append(record)
+
+        cursor = self._conn.cursor()
+        new_records = []
+
+        for start in range(0, len(unique), INSERT_CHUNK_ROWS):
+            chunk = unique[start:start + INSERT_CHUNK_ROWS]
+            placeholders = ", ".join("(?, ?)" for _ in chunk)
+            params = []
+            for record in chunk:
+                params.extend((record[0], record[3]))
+
+            cursor.execute(
+                "SELECT symbol, timestamp FROM market_data "
+                f"WHERE (symbol, timestamp) IN (VALUES {placeholders})",
+                params
+            )
+            existing = set(cursor.fetchall())
+            new_records.extend(r for r in chunk if (r[0], r[3]) not in existing)
+
+        return new_records
+
+    def save_records(self, records: list) -> int:
+        """
+        Save pre-built row tuples directly, bypassing DataFrame handling
+
+        Fast path for callers that already hold rows in insert order
+        (symbol, price, volume, timestamp, provider, processed_at) -
+        no frame copy, no column extraction, straight to executemany.
+
+        Args:
+            records: List of 6-tuples in insert column order
+
+        Returns:
+            Number of records actually saved (duplicates excluded)
+        """
+        if not records:
+            logger.info("No data to save to database")
+            return 0
+
+        # Same locality trick as save_to_database: write the UNIQUE
+        # B-tree in key order
+        records = sorted(records, key=lambda r: (r[0], r[3]))
+
+        cursor = self._conn.cursor()
         saved_count = 0
-        
+
         try:
-            with sqlite3.connect(self.db_path) as conn:
-                cursor = conn.cursor()
-                
-                for _, row in df.iterrows():
-                    try:
-                        cursor.execute('''
-                            INSERT INTO market_data 
-                            (symbol, price, volume, timestamp, provider, processed_at)
-                            VALUES (?, ?, ?, ?, ?, ?)
-                        ''', (
-                            row['symbol'],
-                            row['price'],
-                            row['volume'],
-                            row['timestamp'],
-                            row.get('provider', 'unknown'),
-                            row.get('processed_at', pd.Timestamp.utcnow().isoformat())
-                        ))
-                        saved_count += 1
-                    
-                    except sqlite3.IntegrityError:
-                        # Skip duplicate
-                        continue
-                
-                conn.commit()
-                logger.info(f"Saved {saved_count}/{len(df)} records (skipped duplicates)")
-        
+            cursor.execute("BEGIN IMMEDIATE")
+
+            for start in range(0, len(records), INSERT_CHUNK_ROWS):
+                cursor.executemany(_INSERT_SQL, records[start:start + INSERT_CHUNK_ROWS])
+
+                saved_count += max(cursor.rowcount, 0)
+
+            cursor.execute("COMMIT")
+            logger.info(f"Saved {saved_count}/{len(records)} records to database (duplicates skipped)")
+
         except Exception as e:
-            logger.error(f"Error in individual save: {e}")
+            if self._conn.in_transaction:
+                cursor.execute("ROLLBACK")
+            logger.error(f"Error saving records to database: {e}")
             raise
-        
+
         return saved_count
-    
+
     def load_from_database(self, symbol: str = None, limit: int = None) -> pd.DataFrame:
         """
         Load data from database
@@ -172,24 +374,23 @@ class DataStorage:
             DataFrame with market data
         """
         try:
-            with sqlite3.connect(self.db_path) as conn:
-                query = "SELECT * FROM market_data"
-                params = []
-                
-                if symbol:
-                    query += " WHERE symbol = ?"
-                    params.append(symbol)
-                
-                query += " ORDER BY timestamp DESC"
-                
-                if limit:
-                    query += f" LIMIT {limit}"
-                
-                df = pd.read_sql_query(query, conn, params=params)
-                
-                logger.info(f"Loaded {len(df)} records from database")
-                return df
-        
+            query = "SELECT * FROM market_data"
+            params = []
+
+            if symbol:
+                query += " WHERE symbol = ?"
+                params.append(symbol)
+
+            query += " ORDER BY timestamp DESC"
+
+            if limit:
+                query += f" LIMIT {limit}"
+
+            df = pd.read_sql_query(query, self._conn, params=params, **_READ_SQL_KWARGS)
+
+            logger.info(f"Loaded {len(df)} records from database")
+            return df
+
         except Exception as e:
             logger.error(f"Error loading from database: {e}")
             return pd.DataFrame()
@@ -202,22 +403,13 @@ class DataStorage:
             DataFrame with latest prices per symbol
         """
         try:
-            with sqlite3.connect(self.db_path) as conn:
-                query = '''
-                    SELECT symbol, price, volume, timestamp, provider
-                    FROM market_data
-                    WHERE (symbol, timestamp) IN (
-                        SELECT symbol, MAX(timestamp)
-                        FROM market_data
-                        GROUP BY symbol
-                    )
-                    ORDER BY symbol
-                '''
-                
-                df = pd.read_sql_query(query, conn)
-                logger.info(f"Retrieved latest prices for {len(df)} symbols")
-                return df
-        
+            # ROW_NUMBER over (symbol, timestamp DESC) picks the newest
+            # row per symbol in one pass - no correlated GROUP BY subquery
+            # re-scanning the table
+            df = pd.read_sql_query(_LATEST_PRICES_SQL, self._conn, **_READ_SQL_KWARGS)
+            logger.info(f"Retrieved latest prices for {len(df)} symbols")
+            return df
+
         except Exception as e:
             logger.error(f"Error getting latest prices: {e}")
             return pd.DataFrame()
@@ -232,28 +424,70 @@ class DataStorage:
         """
         try:
             if df is None:
-                # Load all data from database
-                df = self.load_from_database()
-            
+                # Stream the table in chunks instead of materializing it
+                # all at once - keeps memory flat for large databases
+                self._export_database_to_csv(append)
+                return
+
             if df.empty:
                 logger.info("No data to export to CSV")
                 return
-            
+
             # Remove database-specific columns if present
             columns_to_drop = ['id', 'created_at']
             df = df.drop(columns=[col for col in columns_to_drop if col in df.columns])
-            
+
             # Export to CSV
             mode = 'a' if append and self.csv_path.exists() else 'w'
             header = not (append and self.csv_path.exists())
-            
+
             df.to_csv(self.csv_path, mode=mode, header=header, index=False)
-            
+
             logger.info(f"Exported {len(df)} records to {self.csv_path}")
-        
+
         except Exception as e:
             logger.error(f"Error exporting to CSV: {e}")
             raise
+
+    def _append_records_to_csv(self, records: list):
+        """
+        Append row tuples to the CSV export without a DataFrame
+
+        Args:
+            records: List of tuples in insert column order
+        """
+        write_header = not self.csv_path.exists()
+
+        with open(self.csv_path, 'a', newline='') as f:
+            writer = csv.writer(f)
+            if write_header:
+                writer.writerow(['symbol', 'price', 'volume', 'timestamp',
+                                 'provider', 'processed_at'])
+            writer.writerows(records)
+
+        logger.info(f"Exported {len(records)} records to {self.csv_path}")
+
+    def _export_database_to_csv(self, append: bool = False):
+        """
+        Export the full market_data table to CSV in streaming chunks
+
+        Args:
+            append: Whether to append to existing file
+        """
+        mode = 'a' if append and self.csv_path.exists() else 'w'
+        header = not (append and self.csv_path.exists())
+
+        exported = 0
+        for chunk in pd.read_sql_query(_EXPORT_SQL, self._conn, chunksize=EXPORT_CHUNK_ROWS):
+            chunk.to_csv(self.csv_path, mode=mode, header=header, index=False)
+            exported += len(chunk)
+            mode = 'a'
+            header = False
+
+        if exported == 0:
+            logger.info("No data to export to CSV")
+        else:
+            logger.info(f"Exported {exported} records to {self.csv_path}")
     
     def get_statistics(self) -> dict:
         """
@@ -263,42 +497,36 @@ class DataStorage:
             Dictionary with database stats
         """
         try:
-            with sqlite3.connect(self.db_path) as conn:
-                cursor = conn.cursor()
-                
-                # Total records
-                cursor.execute("SELECT COUNT(*) FROM market_data")
-                total_records = cursor.fetchone()[0]
-                
-                # Unique symbols
-                cursor.execute("SELECT COUNT(DISTINCT symbol) FROM market_data")
-                unique_symbols = cursor.fetchone()[0]
-                
-                # Date range
-                cursor.execute("SELECT MIN(timestamp), MAX(timestamp) FROM market_data")
-                date_range = cursor.fetchone()
-                
-                # Records per symbol
-                cursor.execute('''
-                    SELECT symbol, COUNT(*) as count 
-                    FROM market_data 
-                    GROUP BY symbol
-                    ORDER BY count DESC
-                ''')
-                symbol_counts = cursor.fetchall()
-                
-                stats = {
-                    'total_records': total_records,
-                    'unique_symbols': unique_symbols,
-                    'date_range': {
-                        'earliest': date_range[0],
-                        'latest': date_range[1]
-                    },
-                    'records_per_symbol': dict(symbol_counts)
-                }
-                
-                return stats
-        
+            cursor = self._conn.cursor()
+
+            # Scalar aggregates in one table scan instead of three
+            cursor.execute('''
+                SELECT COUNT(*), COUNT(DISTINCT symbol), MIN(timestamp), MAX(timestamp)
+                FROM market_data
+            ''')
+            total_records, unique_symbols, earliest, latest = cursor.fetchone()
+
+            # Records per symbol
+            cursor.execute('''
+                SELECT symbol, COUNT(*) as count
+                FROM market_data
+                GROUP BY symbol
+                ORDER BY count DESC
+            ''')
+            symbol_counts = cursor.fetchall()
+
+            stats = {
+                'total_records': total_records,
+                'unique_symbols': unique_symbols,
+                'date_range': {
+                    'earliest': earliest,
+                    'latest': latest
+                },
+                'records_per_symbol': dict(symbol_counts)
+            }
+
+            return stats
+
         except Exception as e:
             logger.error(f"Error getting statistics: {e}")
             return {}
@@ -314,52 +542,83 @@ class DataStorage:
             Number of records deleted
         """
         try:
-            with sqlite3.connect(self.db_path) as conn:
-                cursor = conn.cursor()
-                
-                cursor.execute('''
-                    DELETE FROM market_data 
-                    WHERE datetime(timestamp) < datetime('now', '-' || ? || ' days')
-                ''', (days,))
-                
-                deleted = cursor.rowcount
-                conn.commit()
-                
-                logger.info(f"Cleaned up {deleted} records older than {days} days")
-                return deleted
-        
+            cursor = self._conn.cursor()
+
+            # Compare against a precomputed ISO cutoff string: timestamps
+            # are stored in sortable ISO format, so a plain < comparison
+            # can use the timestamp index instead of calling datetime()
+            # on every row
+            cutoff = (datetime.utcnow() - timedelta(days=days)).isoformat()
+
+            cursor.execute('''
+                DELETE FROM market_data
+                WHERE timestamp < ?
+            ''', (cutoff,))
+
+            deleted = cursor.rowcount
+
+            logger.info(f"Cleaned up {deleted} records older than {days} days")
+            return deleted
+
         except Exception as e:
             logger.error(f"Error cleaning up old data: {e}")
             return 0
 
 
+# Shared default-path storage instance for the convenience functions,
+# so repeated calls reuse one connection instead of reconnecting
+_STORAGE = None
+
+
+def _get_storage() -> DataStorage:
+    """Return the shared DataStorage instance (created on first use)"""
+    global _STORAGE
+    if _STORAGE is None:
+        _STORAGE = DataStorage()
+    return _STORAGE
+
+
 # Convenience functions
-def save_data(df: pd.DataFrame) -> int:
+def save_data(data) -> int:
     """
     Convenience function to save data
-    
+
     Args:
-        df: DataFrame to save
-    
+        data: DataFrame to save, or a list of insert-ready row tuples
+            (as produced by transform_market_data(as_records=True)),
+            which skips DataFrame handling entirely
+
     Returns:
         Number of records saved
     """
-    storage = DataStorage()
-    count = storage.save_to_database(df)
-    storage.export_to_csv(df, append=True)
+    storage = _get_storage()
+
+    if isinstance(data, list):
+        # Work out which rows are genuinely new first, so the CSV export
+        # only receives the rows the INSERT OR IGNORE actually adds -
+        # appending the raw batch would re-write every duplicate the
+        # database just suppressed
+        new_records = storage.filter_new_records(data)
+        count = storage.save_records(new_records)
+        if new_records:
+            storage._append_records_to_csv(new_records)
+        return count
+
+    count = storage.save_to_database(data)
+    storage.export_to_csv(data, append=True)
     return count
 
 
 def load_data(symbol: str = None, limit: int = None) -> pd.DataFrame:
     """
     Convenience function to load data
-    
+
     Args:
         symbol: Filter by symbol
         limit: Maximum records
-    
+
     Returns:
         DataFrame with data
     """
-    storage = DataStorage()
+    storage = _get_storage()
     return storage.load_from_database(symbol, limit)
@@ -156,6 +156,88 @@ class TestAlertLogic(unittest.TestCase):
         self.assertEqual(len(alerts), 0)
 
 
+class TestStorageRecords(unittest.TestCase):
+    """Test the tuple-based records save path"""
+
+    def test_save_records_round_trip(self):
+        """Test saving transformed record tuples and duplicate suppression"""
+        import tempfile
+        from transform_data import transform_market_data
+        from storage import DataStorage
+
+        sample_data = [
+            {
+                'symbol': 'AAPL',
+                'price': 150.50,
+                'volume': 1000000,
+                'timestamp': '2024-02-10T10:00:00',
+                'provider': 'yfinance'
+            },
+            {
+                'symbol': 'MSFT',
+                'price': 350.75,
+                'volume': 500000,
+                'timestamp': '2024-02-10T10:00:00',
+                'provider': 'yfinance'
+            }
+        ]
+
+        records = transform_market_data(sample_data, as_records=True)
+
+        # Should be insert-ready 6-tuples
+        self.assertEqual(len(records), 2)
+        self.assertEqual(len(records[0]), 6)
+
+        tmp_dir = Path(tempfile.mkdtemp())
+        storage = DataStorage(db_path=tmp_dir / 'test.db', csv_path=tmp_dir / 'test.csv')
+
+        # First save inserts everything, re-save is fully deduplicated
+        self.assertEqual(storage.save_records(records), 2)
+        self.assertEqual(storage.save_records(records), 0)
+        self.assertEqual(len(storage.load_from_database()), 2)
+
+        # Saved keys are no longer considered new
+        self.assertEqual(storage.filter_new_records(records), [])
+
+        storage.close()
+
+    def test_save_data_csv_stays_deduplicated(self):
+        """Test that repeated saves don't re-append duplicates to the CSV"""
+        import tempfile
+        import storage as storage_module
+        from transform_data import transform_market_data
+        from storage import DataStorage, save_data
+
+        sample_data = [
+            {
+                'symbol': 'AAPL',
+                'price': 150.50,
+                'volume': 1000000,
+                'timestamp': '2024-02-10T10:00:00',
+                'provider': 'yfinance'
+            }
+        ]
+
+        records = transform_market_data(sample_data, as_records=True)
+
+        tmp_dir = Path(tempfile.mkdtemp())
+        storage = DataStorage(db_path=tmp_dir / 'test.db', csv_path=tmp_dir / 'test.csv')
+
+        # Point the shared instance at the test database for save_data
+        previous = storage_module._STORAGE
+        storage_module._STORAGE = storage
+        try:
+            self.assertEqual(save_data(records), 1)
+            self.assertEqual(save_data(records), 0)
+        finally:
+            storage_module._STORAGE = previous
+            storage.close()
+
+        # Header plus exactly one data row, despite the duplicate save
+        csv_lines = (tmp_dir / 'test.csv').read_text().splitlines()
+        self.assertEqual(len(csv_lines), 2)
+
+
 class TestConfiguration(unittest.TestCase):
     """Test configuration management"""
     
@@ -192,6 +274,7 @@ def run_tests():
     # Add all test classes
     suite.addTests(loader.loadTestsFromTestCase(TestDataTransformer))
     suite.addTests(loader.loadTestsFromTestCase(TestAlertLogic))
+    suite.addTests(loader.loadTestsFromTestCase(TestStorageRecords))
     suite.addTests(loader.loadTestsFromTestCase(TestConfiguration))
     
     # Run tests
@@ -6,7 +6,8 @@ Cleans, validates, and standardizes market data
 import logging
 import pandas as pd
 from datetime import datetime
-from typing import List, Dict
+from typing import Dict, List, Union
+from fetch_data import QuoteBatch
 
 # Configure logging
 logger = logging.getLogger(__name__)
@@ -18,24 +19,29 @@ class DataTransformer:
     """
     
     @staticmethod
-    def clean_and_standardize(raw_data: List[Dict]) -> pd.DataFrame:
+    def clean_and_standardize(raw_data: Union[QuoteBatch, List[Dict]]) -> pd.DataFrame:
         """
         Clean and standardize raw market data
-        
+
         Args:
-            raw_data: List of quote dictionaries from API
-        
+            raw_data: QuoteBatch or list of quote dictionaries from API
+
         Returns:
             Cleaned pandas DataFrame
         """
         logger.info(f"Transforming {len(raw_data)} records")
-        
+
         if not raw_data:
             logger.warning("No data to transform")
             return pd.DataFrame(columns=['symbol', 'price', 'volume', 'timestamp', 'provider'])
-        
-        # Convert to DataFrame
-        df = pd.DataFrame(raw_data)
+
+        # A QuoteBatch is already column-oriented; only convert when we
+        # were handed a list of dicts
+        frame = getattr(raw_data, 'frame', None)
+        if frame is not None:
+            df = frame.copy()
+        else:
+            df = pd.DataFrame(raw_data)
         
         # Initial record count
         initial_count = len(df)
@@ -60,43 +66,50 @@ class DataTransformer:
             df['provider'] = 'unknown'
             logger.info("Added missing 'provider' column with default value 'unknown'")
         
-        # Step 3: Clean missing values
-        # Drop rows where price is None/NaN (critical field)
-        df = df.dropna(subset=['price'])
-        logger.info(f"Dropped {initial_count - len(df)} rows with missing price")
-        
-        # Fill missing volume with 0
-        df['volume'] = df['volume'].fillna(0)
-        
-        # Fill missing symbols with 'UNKNOWN'
+        # Step 3: Fill missing symbols with 'UNKNOWN'
         df['symbol'] = df['symbol'].fillna('UNKNOWN')
-        
+
         # Step 4: Ensure numeric consistency
         try:
             df['price'] = pd.to_numeric(df['price'], errors='coerce')
-            df['volume'] = pd.to_numeric(df['volume'], errors='coerce').fillna(0).astype(int)
+            # Single conversion pass: coerce, default missing/bad values
+            # to 0 and land directly on int64 (the database column type)
+            df['volume'] = pd.to_numeric(df['volume'], errors='coerce').fillna(0).astype('int64')
         except Exception as e:
             logger.error(f"Error converting to numeric: {e}")
             raise
-        
-        # Drop any rows where price conversion failed
-        before_numeric_clean = len(df)
-        df = df.dropna(subset=['price'])
-        if before_numeric_clean > len(df):
-            logger.warning(f"Dropped {before_numeric_clean - len(df)} rows with invalid numeric values")
-        
-        # Step 5: Convert timestamps to UTC
-        df['timestamp'] = df['timestamp'].apply(DataTransformer._normalize_timestamp)
+
+        # Drop missing, unparseable, and non-positive prices with one
+        # combined mask - a single filtered copy instead of a dropna /
+        # dropna / boolean-filter sequence that reallocates each time
+        mask = df['price'].notna() & (df['price'] > 0)
+        dropped = int((~mask).sum())
+        if dropped:
+            logger.info(f"Dropped {dropped} rows with missing or invalid price")
+        df = df.loc[mask].copy()
+
+        # Step 5: Convert timestamps to UTC (vectorized - one parse pass
+        # over the whole column instead of a Python call per row)
+        ts = pd.to_datetime(df['timestamp'], utc=True, errors='coerce', format='ISO8601')
+        invalid = int(ts.isna().sum())
+        if invalid:
+            logger.warning(f"Replaced {invalid} unparseable timestamps with current UTC time")
+            ts = ts.fillna(pd.Timestamp.utcnow())
+        # Drop the tz suffix so the output matches datetime.isoformat()
+        df['timestamp'] = ts.dt.tz_localize(None).dt.strftime('%Y-%m-%dT%H:%M:%S.%f')
         
         # Step 6: Add processed timestamp
         df['processed_at'] = datetime.utcnow().isoformat()
         
         # Step 7: Sort by timestamp
         df = df.sort_values('timestamp', ascending=False)
-        
-        # Step 8: Validate price values (must be positive)
-        df = df[df['price'] > 0]
-        
+
+        # Step 8: Use categorical dtype for the low-cardinality string
+        # columns - repeated symbol/provider values share one backing
+        # array of codes instead of a Python string object per row
+        df['symbol'] = df['symbol'].astype('category')
+        df['provider'] = df['provider'].astype('category')
+
         # Final validation
         final_count = len(df)
         logger.info(f"Transformation complete: {final_count} clean records")
@@ -107,13 +120,15 @@ class DataTransformer:
         return df
     
     @staticmethod
-    def _normalize_timestamp(timestamp_str: str) -> str:
+    def _normalize_timestamp(timestamp_str: str, fallback_iso: str = None) -> str:
         """
         Normalize timestamp to UTC ISO format
-        
+
         Args:
             timestamp_str: Timestamp string
-        
+            fallback_iso: Precomputed ISO fallback for invalid values, so
+                callers normalizing many values read the clock only once
+
         Returns:
             ISO format UTC timestamp
         """
@@ -126,10 +141,10 @@ class DataTransformer:
             else:
                 # If datetime object
                 return timestamp_str.isoformat()
-        
+
         except Exception as e:
             logger.warning(f"Error normalizing timestamp '{timestamp_str}': {e}. Using current UTC time.")
-            return datetime.utcnow().isoformat()
+            return fallback_iso or datetime.utcnow().isoformat()
     
     @staticmethod
     def remove_duplicates(df: pd.DataFrame, existing_df: pd.DataFrame = None) -> pd.DataFrame:
@@ -148,19 +163,13 @@ class DataTransformer:
         # Remove duplicates within new data
         df = df.drop_duplicates(subset=['symbol', 'timestamp'], keep='first')
         
-        # If existing data provided, remove records that already exist
+        # If existing data provided, remove records that already exist.
+        # MultiIndex.isin does the (symbol, timestamp) membership test
+        # without building concatenated key strings or mutating either frame
         if existing_df is not None and not existing_df.empty:
-            # Create a composite key for comparison
-            df['_key'] = df['symbol'] + '_' + df['timestamp']
-            existing_df['_key'] = existing_df['symbol'] + '_' + existing_df['timestamp']
-            
-            # Filter out existing records
-            df = df[~df['_key'].isin(existing_df['_key'])]
-            
-            # Drop the temporary key column
-            df = df.drop('_key', axis=1)
-            if '_key' in existing_df.columns:
-                existing_df.drop('_key', axis=1, inplace=True)
+            existing_keys = pd.MultiIndex.from_frame(existing_df[['symbol', 'timestamp']])
+            new_keys = pd.MultiIndex.from_frame(df[['symbol', 'timestamp']])
+            df = df[~new_keys.isin(existing_keys)]
         
         removed_count = initial_count - len(df)
         if removed_count > 0:
@@ -200,24 +209,51 @@ class DataTransformer:
         return stats
 
 
+# Column order expected by DataStorage.save_records
+RECORD_COLUMNS = ('symbol', 'price', 'volume', 'timestamp', 'provider', 'processed_at')
+
+
 # Convenience function
-def transform_market_data(raw_data: List[Dict], existing_data: pd.DataFrame = None) -> pd.DataFrame:
+def transform_market_data(raw_data: Union[QuoteBatch, List[Dict]],
+                          existing_data: pd.DataFrame = None,
+                          as_records: bool = False):
     """
     Convenience function to transform market data
-    
+
     Args:
-        raw_data: List of raw quote dictionaries
+        raw_data: QuoteBatch or list of raw quote dictionaries
         existing_data: Existing DataFrame to check for duplicates
-    
+        as_records: Return insert-ready row tuples instead of a
+            DataFrame, for callers that only need to persist the data
+
     Returns:
-        Clean, transformed DataFrame
+        Clean, transformed DataFrame, or a list of tuples in
+        RECORD_COLUMNS order when as_records is True
     """
     transformer = DataTransformer()
-    
+
     # Clean and standardize
     df = transformer.clean_and_standardize(raw_data)
-    
+
     # Remove duplicates
     df = transformer.remove_duplicates(df, existing_data)
-    
+
+    if as_records:
+        # Empty input short-circuits: the empty frame from
+        # clean_and_standardize has no processed_at column to extract
+        if df.empty:
+            return []
+
+        # Emit plain tuples column-wise; categoricals go back to str so
+        # the rows bind directly in sqlite3 and serialize cleanly to CSV
+        cols = [
+            df['symbol'].astype(str).to_numpy(),
+            df['price'].to_numpy(),
+            df['volume'].to_numpy(),
+            df['timestamp'].to_numpy(),
+            df['provider'].astype(str).to_numpy(),
+            df['processed_at'].to_numpy(),
+        ]
+        return list(zip(*cols))
+
     return df